@@ -1,3 +1,4 @@
+from ._dists import LogUniform, Uniform
 from .aerosol import AerosolProcesses, AerosolSpecies, AerosolModeDistribution, \
                      AerosolModalSizeDistribution
 from .gas import GasSpecies
@@ -0,0 +1,61 @@
+"""ambrs._dists - lightweight uniform and loguniform distributions for use in
+ensemble specifications
+
+These distributions are simple descriptors of their bounds. Unlike frozen
+scipy.stats distributions, they're hashable, cheap to pickle, and are sampled
+directly with the closed-form functions in ambrs._fast_dists. Frozen scipy.stats
+distributions can still be used wherever these are accepted.
+"""
+
+import numpy as np
+
+from dataclasses import dataclass
+from typing import Callable
+from ._fast_dists import check_loguniform_bounds, check_uniform_bounds, \
+                         loguniform_ppf, loguniform_rvs, uniform_ppf, uniform_rvs
+
+@dataclass(frozen=True, slots=True)
+class Uniform:
+    """Uniform(lo, hi): the uniform distribution on [lo, hi]"""
+    lo: float
+    hi: float
+
+    def __post_init__(self):
+        check_uniform_bounds(self.lo, self.hi)
+
+    def ppf(self, u: np.array) -> np.array:
+        """dist.ppf(u) -> inverse CDF of the distribution evaluated at the
+quantiles u"""
+        return uniform_ppf(u, self.lo, self.hi)
+
+    def rvs(self, n: int, rng = None) -> np.array:
+        """dist.rvs(n, [rng]) -> array of n values drawn from the distribution.
+The optional rng argument is a numpy.random.Generator or a seed from which one
+is created with numpy.random.default_rng."""
+        return uniform_rvs(self.lo, self.hi, n, np.random.default_rng(rng))
+
+    def _closed_form(self) -> tuple[Callable, float, float]:
+        return uniform_ppf, float(self.lo), float(self.hi)
+
+@dataclass(frozen=True, slots=True)
+class LogUniform:
+    """LogUniform(lo, hi): the loguniform distribution on [lo, hi] (0 < lo)"""
+    lo: float
+    hi: float
+
+    def __post_init__(self):
+        check_loguniform_bounds(self.lo, self.hi)
+
+    def ppf(self, u: np.array) -> np.array:
+        """dist.ppf(u) -> inverse CDF of the distribution evaluated at the
+quantiles u"""
+        return loguniform_ppf(u, self.lo, self.hi)
+
+    def rvs(self, n: int, rng = None) -> np.array:
+        """dist.rvs(n, [rng]) -> array of n values drawn from the distribution.
+The optional rng argument is a numpy.random.Generator or a seed from which one
+is created with numpy.random.default_rng."""
+        return loguniform_rvs(self.lo, self.hi, n, np.random.default_rng(rng))
+
+    def _closed_form(self) -> tuple[Callable, float, float]:
+        return loguniform_ppf, float(self.lo), float(self.hi)
@@ -0,0 +1,84 @@
+"""ambrs._fast_dists - closed-form inverse CDFs and samplers for the uniform and
+loguniform distributions used in ensemble specifications
+
+scipy.stats' frozen distributions are general, but evaluating them goes
+through a lot of argument checking and dispatch. The functions here work
+directly on numpy arrays (with bounds that broadcast against them), and
+fast_ppf extracts the bounds from frozen scipy.stats distributions so that
+these functions can be used in their place.
+"""
+
+import numpy as np
+
+from typing import Callable, Optional
+
+def uniform_ppf(u: np.array, lo, hi) -> np.array:
+    """uniform_ppf(u, lo, hi) -> inverse CDF of the uniform distribution on
+[lo, hi] evaluated at the quantiles u"""
+    return lo + u * (hi - lo)
+
+def loguniform_ppf(u: np.array, lo, hi) -> np.array:
+    """loguniform_ppf(u, lo, hi) -> inverse CDF of the loguniform distribution
+on [lo, hi] evaluated at the quantiles u"""
+    log_lo = np.log(lo)
+    return np.exp(log_lo + u * (np.log(hi) - log_lo))
+
+def uniform_rvs(lo: float, hi: float, size, rng: np.random.Generator) -> np.array:
+    """uniform_rvs(lo, hi, size, rng) -> array of the given size containing
+values drawn from the uniform distribution on [lo, hi]"""
+    return uniform_ppf(rng.random(size), lo, hi)
+
+def loguniform_rvs(lo: float, hi: float, size, rng: np.random.Generator) -> np.array:
+    """loguniform_rvs(lo, hi, size, rng) -> array of the given size containing
+values drawn from the loguniform distribution on [lo, hi]"""
+    return loguniform_ppf(rng.random(size), lo, hi)
+
+def check_uniform_bounds(lo: float, hi: float) -> None:
+    """check_uniform_bounds(lo, hi) -> throws a ValueError if [lo, hi] isn't a
+valid support for a uniform distribution"""
+    if not lo <= hi:
+        raise ValueError(f'invalid bounds for uniform distribution: [{lo}, {hi}]')
+
+def check_loguniform_bounds(lo: float, hi: float) -> None:
+    """check_loguniform_bounds(lo, hi) -> throws a ValueError if [lo, hi] isn't
+a valid support for a loguniform distribution"""
+    if not 0 < lo <= hi:
+        raise ValueError(f'invalid bounds for loguniform distribution: [{lo}, {hi}]')
+
+# Each entry maps a scipy.stats distribution name to (ppf, check, shiftable),
+# where check validates the distribution's support [lo, hi], and shiftable
+# indicates whether the distribution keeps its closed form when shifted by a
+# nonzero loc parameter (shifted loguniform distributions aren't loguniform).
+_SCIPY_DISTRIBUTIONS = {
+    'uniform':    (uniform_ppf,    check_uniform_bounds,    True),
+    'loguniform': (loguniform_ppf, check_loguniform_bounds, False),
+    'reciprocal': (loguniform_ppf, check_loguniform_bounds, False),
+}
+
+def _loc(dist) -> float:
+    # loc is given either by keyword or as the first argument after the shapes
+    if 'loc' in dist.kwds:
+        return dist.kwds['loc']
+    num_shapes = dist.dist.numargs
+    return dist.args[num_shapes] if len(dist.args) > num_shapes else 0
+
+def fast_ppf(dist) -> Optional[tuple[Callable, float, float]]:
+    """fast_ppf(dist) -> (ppf, lo, hi) for a frozen scipy.stats uniform or
+loguniform distribution on [lo, hi], where ppf(u, lo, hi) is the corresponding
+closed-form inverse CDF, or None if the distribution has no closed form here.
+Like scipy.stats, this throws a ValueError if the distribution's parameters are
+invalid."""
+    generator = getattr(dist, 'dist', None)
+    name = getattr(generator, 'name', None)
+    if name not in _SCIPY_DISTRIBUTIONS:
+        return None
+    ppf, check, shiftable = _SCIPY_DISTRIBUTIONS[name]
+    if not shiftable and _loc(dist) != 0:
+        return None
+    lo, hi = dist.support()
+    if np.ndim(lo) != 0 or np.ndim(hi) != 0: # leave array parameters to scipy
+        return None
+    if not (np.isfinite(lo) and np.isfinite(hi)): # scipy's sign of bad parameters
+        raise ValueError(f'invalid parameters for scipy.stats.{name} distribution')
+    check(lo, hi)
+    return ppf, float(lo), float(hi)
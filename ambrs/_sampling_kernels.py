@@ -0,0 +1,66 @@
+"""ambrs._sampling_kernels - kernels that map quantiles to the parameters of
+sampled aerosol modes
+
+If numba is installed, the kernels here are JIT-compiled into a single fused
+pass over the ensemble, which avoids the temporary arrays created by the
+equivalent numpy operations. Loading the compiled kernels costs a few hundred
+milliseconds per process, though, so we only use them for ensembles with at
+least numba_min_samples members. Otherwise, we fall back to numpy.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    have_numba = True
+except ImportError:
+    have_numba = False
+
+# the smallest number of samples for which the numba kernels are used
+numba_min_samples = 1_000_000
+
+def _fill_mode_numpy(U: np.array,
+                     lows: np.array,
+                     highs: np.array,
+                     is_log: np.array,
+                     out: np.array) -> None:
+    np.multiply(U, highs - lows, out = out)
+    out += lows
+    np.exp(out, where = is_log, out = out)
+    mass_fractions = out[:,3:]
+    mass_fractions /= mass_fractions.sum(axis = 1, keepdims = True)
+
+if have_numba:
+    @njit(parallel = True, fastmath = True, cache = True)
+    def _fill_mode_numba(U, lows, highs, is_log, out):
+        n, d = U.shape
+        for i in prange(n):
+            total = 0.0
+            for j in range(d):
+                x = lows[j] + U[i,j] * (highs[j] - lows[j])
+                if is_log[j]:
+                    x = np.exp(x)
+                out[i,j] = x
+                if j >= 3:
+                    total += x
+            for j in range(3, d):
+                out[i,j] /= total
+
+def fill_mode(U: np.array,
+              lows: np.array,
+              highs: np.array,
+              is_log: np.array,
+              out: np.array) -> None:
+    """fill_mode(U, lows, highs, is_log, out) -> maps the quantiles in U, a
+(n, 3 + k) array with indices (sample index, parameter index) for the number,
+geometric mean diameter, log10 geometric std dev, and k mass fractions of a
+mode, to values of these parameters on the intervals [lows[j], highs[j]],
+storing them in out, a (n, 3 + k) AerosolModePopulation data array. The mass
+fractions in each row of out are normalized to sum to 1. If is_log[j] is True,
+the bounds for parameter j are given in terms of their natural logarithms, and
+the parameter is loguniform. U and out may be the same array, in which case the
+quantiles are mapped in place."""
+    if have_numba and U.shape[0] >= numba_min_samples:
+        _fill_mode_numba(U, lows, highs, is_log, out)
+    else:
+        _fill_mode_numpy(U, lows, highs, is_log, out)
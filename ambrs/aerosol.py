@@ -2,19 +2,73 @@
 
 We use frozen scipy.stats distributions (specifically the rv_continuous ones)
 for sampling. These frozen distributions fix the shape parameters, location, and
-scale factors for each random variable.
+scale factors for each random variable. The lightweight ambrs.Uniform and
+ambrs.LogUniform distributions can be used in their place.
 """
 
+import numbers
 import numpy as np
 import scipy.stats
 
-from dataclasses import dataclass
-from typing import Optional, TypeVar
+from dataclasses import dataclass, field, fields
+from typing import Callable, Optional, TypeVar
+from ._dists import LogUniform, Uniform
+from ._fast_dists import fast_ppf, loguniform_ppf, uniform_ppf
 
 # this type represents a frozen scipy.stats.rv_continous distribution
 # (this frozen type isn't made available by the scipy.stats package)
 RVFrozenDistribution = TypeVar('RVFrozenDistribution')
 
+# sampled parameters can be given lightweight ambrs distributions or frozen
+# scipy.stats distributions
+Distribution = Uniform | LogUniform | RVFrozenDistribution
+
+#----------------------------------------------
+# Flattened descriptions of sampled parameters
+#----------------------------------------------
+
+# Sampled parameters are flattened into a sequence of descriptors, each of which
+# replaces its (frozen scipy.stats) distribution with a closed-form inverse CDF
+# from ambrs._fast_dists when one is available. Parameters with fixed values
+# are treated as degenerate uniform distributions with lo == hi, which map
+# every quantile to their value.
+
+@dataclass(frozen=True)
+class _SampledParameter:
+    """_SampledParameter: a single sampled parameter within a specification,
+with a closed-form inverse CDF for its distribution (if available)"""
+    path: str                       # name of the parameter within its specification
+    dist: Distribution              # distribution from which the parameter is sampled
+    ppf: Optional[Callable] = None  # closed-form inverse CDF ppf(u, lo, hi), if any
+    lo: Optional[float] = None      # lower bound (None if not in closed form)
+    hi: Optional[float] = None      # upper bound (None if not in closed form)
+
+    @property
+    def is_log(self) -> bool: # whether the distribution is loguniform
+        return self.ppf is loguniform_ppf
+
+    @property
+    def is_fixed(self) -> bool: # whether the parameter has a single value
+        return self.ppf is not None and self.lo == self.hi
+
+def _sampled_parameter(path: str,
+                       dist: Distribution | float) -> _SampledParameter:
+    """_sampled_parameter(path, dist) -> _SampledParameter for the parameter with
+the given path, sampled from the given distribution (or fixed to the given
+value)"""
+    if isinstance(dist, numbers.Real):
+        value = float(dist)
+        return _SampledParameter(path = path, dist = dist, ppf = uniform_ppf,
+                                 lo = value, hi = value)
+    if isinstance(dist, (Uniform, LogUniform)):
+        params = dist._closed_form()
+    else:
+        params = fast_ppf(dist)
+    if params is None:
+        return _SampledParameter(path = path, dist = dist)
+    ppf, lo, hi = params
+    return _SampledParameter(path = path, dist = dist, ppf = ppf, lo = lo, hi = hi)
+
 @dataclass
 class AerosolProcesses:
     """AerosolProcesses: a definition of a set of aerosol processes under consideration"""
@@ -38,6 +92,18 @@ specific parameters (no state information)"""
     hygroscopicity: float = 0.0 # "kappa" [-]
     aliases: Optional[tuple[str, ...]] = None # tuple of alternative species names
 
+def species_indices(aerosols: tuple[AerosolSpecies, ...],
+                    species: tuple[AerosolSpecies, ...]) -> np.array:
+    """species_indices(aerosols, species) -> int32 array containing the index
+within aerosols of each of the given species, or throws a ValueError if any of
+these species is not found"""
+    index = {s: i for i, s in enumerate(aerosols)}
+    try:
+        return np.fromiter((index[s] for s in species), dtype = np.int32,
+                           count = len(species))
+    except KeyError as e:
+        raise ValueError(f"aerosol species '{e.args[0].name}' not found in aerosols") from None
+
 #----------------------------
 # Modal aerosol descriptions
 #----------------------------
@@ -53,6 +119,19 @@ log-normal aerosol mode"""
     log10_geom_std_dev: float         # log10 of geometric std dev of diameter
     mass_fractions: tuple[float, ...] # species mass fractions
 
+    def __eq__(self, other) -> bool:
+        # compare scalars before sequences
+        if self is other:
+            return True
+        if not isinstance(other, AerosolModeState):
+            return NotImplemented
+        return self.number == other.number and \
+               self.geom_mean_diam == other.geom_mean_diam and \
+               self.log10_geom_std_dev == other.log10_geom_std_dev and \
+               self.name == other.name and \
+               tuple(self.mass_fractions) == tuple(other.mass_fractions) and \
+               tuple(self.species) == tuple(other.species)
+
     def mass_fraction(self, species_name: str):
         """returns the mass fraction corresponding to the given species name,
 or throws a ValueError."""
@@ -65,40 +144,141 @@ class AerosolModeDistribution:
 log-normal aerosol mode (distribution only--no state information)"""
     name: str
     species: tuple[AerosolSpecies, ...]
-    number: RVFrozenDistribution                     # modal number concentration distribution
-    geom_mean_diam: RVFrozenDistribution             # geometric mean diameter distribution
-    log10_geom_std_dev: float                        # mode-specific logarithmic diameter std dev
-    mass_fractions: tuple[RVFrozenDistribution, ...] # species mass fraction distributions
+    number: Distribution                     # modal number concentration distribution
+    geom_mean_diam: Distribution             # geometric mean diameter distribution
+    log10_geom_std_dev: float | Distribution # mode-specific logarithmic diameter std dev
+                                             # (fixed value or distribution)
+    mass_fractions: tuple[Distribution, ...] # species mass fraction distributions
+
+    # flattened sampled parameters, ordered like the columns of an
+    # AerosolModePopulation's data array
+    _flat_params: tuple[_SampledParameter, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'species', tuple(self.species))
+        object.__setattr__(self, 'mass_fractions', tuple(self.mass_fractions))
+        params = [
+            _sampled_parameter(f'{self.name}.number', self.number),
+            _sampled_parameter(f'{self.name}.geom_mean_diam', self.geom_mean_diam),
+            _sampled_parameter(f'{self.name}.log10_geom_std_dev', self.log10_geom_std_dev),
+        ]
+        params.extend([
+            _sampled_parameter(f'{self.name}.mass_fractions[{s}]', mass_frac)
+            for s, mass_frac in enumerate(self.mass_fractions)
+        ])
+        object.__setattr__(self, '_flat_params', tuple(params))
 
-@dataclass
 class AerosolModePopulation:
     """AerosolModePopulation: a particle population representing a single
 internally-mixed, log-normal aerosol mode, sampled from a specific mode
-distribution"""
-    name: str
-    species: tuple[AerosolSpecies, ...]
-    number: np.array
-    geom_mean_diam: np.array
-    log10_geom_std_dev: np.array
-    mass_fractions: tuple[np.array, ...] # species-specific mass fractions
+distribution
+
+All population data is stored in a single (n, 3 + k) array with indices
+(member index, parameter index), where k is the number of species. Each row
+holds the number concentration, geometric mean diameter, log10 of the
+geometric std dev, and k species mass fractions of one population member, and
+the number, geom_mean_diam, log10_geom_std_dev, and mass_fractions fields are
+views into the columns of this array. The mass_fractions_matrix field is a view
+of all k mass fraction columns, with indices (member index, species index)."""
+    def __init__(self,
+                 name: str,
+                 species: tuple[AerosolSpecies, ...],
+                 number: np.array,
+                 geom_mean_diam: np.array,
+                 log10_geom_std_dev: np.array,
+                 mass_fractions: tuple[np.array, ...]):
+        self.name = name
+        self.species = species
+        self._data = np.empty((len(number), 3 + len(mass_fractions)))
+        self.number = number
+        self.geom_mean_diam = geom_mean_diam
+        self.log10_geom_std_dev = log10_geom_std_dev
+        self.mass_fractions = mass_fractions
+
+    @classmethod
+    def from_array(cls,
+                   name: str,
+                   species: tuple[AerosolSpecies, ...],
+                   data: np.array):
+        """AerosolModePopulation.from_array(name, species, data) -> population
+that stores its data in the given (n, 3 + k) array (without copying it)"""
+        if data.ndim != 2 or data.shape[1] != 3 + len(species):
+            raise ValueError(f'Invalid data array shape for {len(species)}-species mode: {data.shape}')
+        population = cls.__new__(cls)
+        population.name = name
+        population.species = species
+        population._data = data
+        return population
+
+    def __repr__(self) -> str:
+        return f'AerosolModePopulation(name={self.name!r}, species={self.species!r}, ' \
+               f'number={self.number!r}, geom_mean_diam={self.geom_mean_diam!r}, ' \
+               f'log10_geom_std_dev={self.log10_geom_std_dev!r}, ' \
+               f'mass_fractions={self.mass_fractions!r})'
+
+    @property
+    def number(self) -> np.array: # modal number concentrations
+        return self._data[:,0]
+
+    @number.setter
+    def number(self, value: np.array) -> None:
+        self._data[:,0] = value
+
+    @property
+    def geom_mean_diam(self) -> np.array: # geometric mean diameters
+        return self._data[:,1]
+
+    @geom_mean_diam.setter
+    def geom_mean_diam(self, value: np.array) -> None:
+        self._data[:,1] = value
+
+    @property
+    def log10_geom_std_dev(self) -> np.array: # log10 of geometric std devs
+        return self._data[:,2]
+
+    @log10_geom_std_dev.setter
+    def log10_geom_std_dev(self, value: np.array) -> None:
+        self._data[:,2] = value
+
+    @property
+    def mass_fractions(self) -> tuple[np.array, ...]: # species-specific mass fractions
+        return tuple([self._data[:,3+s] for s in range(self._data.shape[1]-3)])
+
+    @mass_fractions.setter
+    def mass_fractions(self, value: tuple[np.array, ...]) -> None:
+        if len(value) != self._data.shape[1]-3:
+            raise ValueError(f'Expected {self._data.shape[1]-3} mass fractions, got {len(value)}')
+        for s, mass_frac in enumerate(value):
+            self._data[:,3+s] = mass_frac
+
+    @property
+    def mass_fractions_matrix(self) -> np.array: # (n, k) species mass fractions
+        return self._data[:,3:]
+
+    def normalize_mass_fractions(self) -> None:
+        """population.normalize_mass_fractions() -> rescales the species mass
+fractions of each population member so that they sum to 1"""
+        mass_fractions = self.mass_fractions_matrix
+        mass_fractions /= mass_fractions.sum(axis = 1, keepdims = True)
 
     def __len__(self) -> int:
-        return len(self.number)
+        return self._data.shape[0]
 
     def __iter__(self) -> AerosolModeState: # for modal state in mode population
-        for i in range(len(self.number)):
-            yield self.member(i)
+        for i in range(len(self)):
+            yield AerosolModeStateView(self, i)
 
     def member(self, i: int) -> AerosolModeState:
         """population.member(i) -> extracts mode state information from ith
 population member"""
+        row = self._data[i].tolist()
         return AerosolModeState(
             name = self.name,
             species = self.species,
-            number = self.number[i],
-            geom_mean_diam = self.geom_mean_diam[i],
-            log10_geom_std_dev = self.log10_geom_std_dev[i],
-            mass_fractions = tuple([mass_frac[i] for mass_frac in self.mass_fractions]))
+            number = row[0],
+            geom_mean_diam = row[1],
+            log10_geom_std_dev = row[2],
+            mass_fractions = tuple(row[3:]))
 
 @dataclass
 class AerosolModalSizeState:
@@ -106,12 +286,23 @@ class AerosolModalSizeState:
 specified in terms of a fixed number of log-normal modes"""
     modes: tuple[AerosolModeState, ...]
 
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, AerosolModalSizeState):
+            return NotImplemented
+        return tuple(self.modes) == tuple(other.modes)
+
 @dataclass(frozen=True)
 class AerosolModalSizeDistribution:
     """AerosolModalSizeDistribution: an aerosol particle size distribution
 specified in terms of a fixed number of log-normal modes"""
     modes: tuple[AerosolModeDistribution, ...]
-    
+
+    def __post_init__(self):
+        # modes may be given as any iterable, so we make sure it's a tuple
+        object.__setattr__(self, 'modes', tuple(self.modes))
+
 @dataclass
 class AerosolModalSizePopulation:
     """AerosolModalSizePopulation: an aerosol population sampled from a specific
@@ -122,12 +313,100 @@ modal particle size distribution"""
         return len(self.modes[0])
 
     def __iter__(self) -> AerosolModalSizeState: # for modal size state in population
-        for i in range(len(self.modes[0].number)):
-            yield AerosolModalSizeState(
-                modes = tuple([mode.member(i) for mode in self.modes]))
+        for i in range(len(self)):
+            yield AerosolModalSizeStateView(self, i)
 
     def member(self, i: int) -> AerosolModalSizeState:
         """population.member(i) -> extracts size state information from ith
 population member"""
         return AerosolModalSizeState(
             modes = tuple([mode.member(i) for mode in self.modes]))
+
+#------------------------------------------
+# Read-only views of population members
+#------------------------------------------
+
+# Iterating over a population yields views of its members that read their
+# state from the population's arrays on first access, instead of copying it into
+# new state objects up front. These views are subclasses of the corresponding
+# state types, so they can be used anywhere those types can, except that their
+# fields can't be modified (use population.member(i) to get a modifiable copy).
+# Copying or pickling a view also gives such a member, but dataclasses.replace
+# can't construct views, so it raises a TypeError for them.
+
+def _reduce_member(member) -> tuple:
+    """_reduce_member(member) -> the value returned by __reduce__ for a view of
+the given (materialized) member, which pickles the view as that member"""
+    return type(member), tuple([getattr(member, f.name) for f in fields(member)])
+
+class AerosolModeStateView(AerosolModeState):
+    """AerosolModeStateView: a read-only view of the ith member of an
+AerosolModePopulation"""
+
+    def __init__(self, population: AerosolModePopulation, i: int):
+        self._population = population
+        self._i = i
+        self._row = None # ith row of population data, read on first access
+
+    def __copy__(self) -> AerosolModeState:
+        return self._population.member(self._i)
+
+    def __deepcopy__(self, memo) -> AerosolModeState:
+        return self._population.member(self._i)
+
+    def __reduce__(self):
+        return _reduce_member(self._population.member(self._i))
+
+    def _values(self) -> list[float]:
+        if self._row is None:
+            self._row = self._population._data[self._i].tolist()
+        return self._row
+
+    @property
+    def name(self) -> str:
+        return self._population.name
+
+    @property
+    def species(self) -> tuple[AerosolSpecies, ...]:
+        return self._population.species
+
+    @property
+    def number(self) -> float:
+        return self._values()[0]
+
+    @property
+    def geom_mean_diam(self) -> float:
+        return self._values()[1]
+
+    @property
+    def log10_geom_std_dev(self) -> float:
+        return self._values()[2]
+
+    @property
+    def mass_fractions(self) -> tuple[float, ...]:
+        return tuple(self._values()[3:])
+
+class AerosolModalSizeStateView(AerosolModalSizeState):
+    """AerosolModalSizeStateView: a read-only view of the ith member of an
+AerosolModalSizePopulation"""
+
+    def __init__(self, population: AerosolModalSizePopulation, i: int):
+        self._population = population
+        self._i = i
+        self._modes = None # views of the member's modes, created on first access
+
+    def __copy__(self) -> AerosolModalSizeState:
+        return self._population.member(self._i)
+
+    def __deepcopy__(self, memo) -> AerosolModalSizeState:
+        return self._population.member(self._i)
+
+    def __reduce__(self):
+        return _reduce_member(self._population.member(self._i))
+
+    @property
+    def modes(self) -> tuple[AerosolModeState, ...]:
+        if self._modes is None:
+            self._modes = tuple([AerosolModeStateView(mode, self._i)
+                                 for mode in self._population.modes])
+        return self._modes
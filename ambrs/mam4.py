@@ -8,6 +8,7 @@ from .scenario import Scenario
 from .ppe import Ensemble
 
 from dataclasses import dataclass
+import numpy as np
 import os.path
 
 @dataclass
@@ -78,10 +79,118 @@ class Input:
     qh2so4: float
     qsoag: float
 
+# names of the species in each MAM4 mode, ordered like the mass fractions in Input
+_MODE_SPECIES = (
+    ('so4', 'pom', 'soa', 'bc', 'dst', 'ncl'), # mode 1 (accumulation mode)
+    ('so4', 'soa', 'ncl'),                     # mode 2 (aitken mode)
+    ('dst', 'ncl', 'so4', 'bc', 'pom', 'soa'), # mode 3 (coarse mode)
+    ('pom', 'bc'),                             # mode 4 (primary carbon mode)
+)
+
+# template for MAM4 namelist files, with placeholders named after Input fields
+_NAMELIST_TEMPLATE = """! generated by ambrs.mam4.AerosolModel.write_input_files
+&time_input
+  mam_dt         = {mam_dt},
+  mam_nstep      = {mam_nstep},
+/
+&cntl_input
+  mdo_gaschem    = {mdo_gaschem},
+  mdo_gasaerexch = {mdo_gasaerexch},
+  mdo_rename     = {mdo_rename},
+  mdo_newnuc     = {mdo_newnuc},
+  mdo_coag       = {mdo_coag},
+/
+&met_input
+  temp           = {temp},
+  press          = {press},
+  RH_CLEA        = {RH_CLEA},
+/
+&chem_input
+  numc1          = {numc1}, ! unit: #/m3
+  numc2          = {numc2},
+  numc3          = {numc3},
+  numc4          = {numc4},
+  !
+  ! mfABCx: mass fraction of species ABC in mode x.
+  ! 
+  ! The mass fraction of mom is calculated by
+  ! 1 - sum(mfABCx). If sum(mfABCx) > 1, an error
+  ! is issued by the test driver. number of species
+  ! ABC in each mode x comes from the MAM4 with mom.
+  ! 
+  mfso41         = {mfso41},
+  mfpom1         = {mfpom1},
+  mfsoa1         = {mfsoa1},
+  mfbc1          = {mfbc1},
+  mfdst1         = {mfdst1},
+  mfncl1         = {mfncl1},
+  mfso42         = {mfso42},
+  mfsoa2         = {mfsoa2},
+  mfncl2         = {mfncl2},
+  mfdst3         = {mfdst3},
+  mfncl3         = {mfncl3},
+  mfso43         = {mfso43},
+  mfbc3          = {mfbc3},
+  mfpom3         = {mfpom3},
+  mfsoa3         = {mfsoa3},
+  mfpom4         = {mfpom4},
+  mfbc4          = {mfbc4},
+  qso2           = {qso2},
+  qh2so4         = {qh2so4},
+  qsoag          = {qsoag},
+/
+"""
+
+# names of the gases needed by MAM4, ordered like the mixing ratios in Input
+_GASES = ('so2', 'h2so4', 'soag')
+
+def _validate_input_args(size, size_type: type, gases, dt: float, nstep: int) -> tuple[int, ...]:
+    """_validate_input_args(size, size_type, gases, dt, nstep) -> indices of the
+gases needed by MAM4 within gases, after checking that the given arguments can
+be used to create MAM4 input (or throwing a ValueError or TypeError)"""
+    if dt <= 0.0:
+        raise ValueError("dt must be positive")
+    if nstep <= 0:
+        raise ValueError("nstep must be positive")
+    if not isinstance(size, size_type):
+        raise TypeError('Non-modal aerosol particle size cannot be used to create MAM4 input!')
+    if len(size.modes) != 4:
+        raise TypeError(f'{len(size.modes)}-mode aerosol particle size cannot be used to create MAM4 input!')
+    indices = []
+    for name in _GASES:
+        g = GasSpecies.find(gases, name)
+        if g == -1:
+            raise ValueError(f"{name.upper()} gas ('{name}') not found in gas species")
+        indices.append(g)
+    return tuple(indices)
+
+def _species_columns(mode, m: int) -> list[int]:
+    """_species_columns(mode, m) -> indices of the mass fractions of the MAM4
+species in mode m (ordered like _MODE_SPECIES[m]) within the mass fractions of
+the given mode state or population, or throws a ValueError"""
+    column = {s.name: j for j, s in enumerate(mode.species)}
+    for name in _MODE_SPECIES[m]:
+        if name not in column:
+            raise ValueError(f"aerosol species '{name}' not found in mode '{mode.name}'")
+    return [column[name] for name in _MODE_SPECIES[m]]
+
 class AerosolModel(BaseAerosolModel):
     def __init__(self, processes: AerosolProcesses):
         BaseAerosolModel.__init__(self, processes)
 
+    def _control_params(self, dt: float, nstep: int) -> dict:
+        # timestepping and aerosol process parameters shared by all inputs
+        return {
+            'mam_dt': dt,
+            'mam_nstep': nstep,
+
+            'mdo_gaschem': 1 if self.processes.gas_phase_chemistry else 0,
+            'mdo_gasaerexch': 1 if self.processes.condensation else 0,
+            'mdo_rename': 1,
+            'mdo_newnuc': 1 if self.processes.nucleation else 0,
+            'mdo_coag': 1 if self.processes.coagulation else 0,
+        }
+
     def create_input(self,
                      scenario: Scenario,
                      dt: float,
@@ -95,67 +204,59 @@ Parameters:
       size distribution
     * dt: a fixed time step size for simulations
     * nsteps: the number of steps in each simulation"""
-        if dt <= 0.0:
-            raise ValueError("dt must be positive")
-        if nstep <= 0:
-            raise ValueError("nstep must be positive")
-        if not isinstance(scenario.size, AerosolModalSizeState):
-            raise TypeError('Non-modal aerosol particle size state cannot be used to create MAM4 input!')
-        if len(scenario.size.modes) != 4:
-            raise TypeError(f'{len(scenario.size.mode)}-mode aerosol particle size state cannot be used to create MAM4 input!')
-        iso2 = GasSpecies.find(scenario.gases, 'so2')
-        if iso2 == -1:
-            raise ValueError("SO2 gas ('so2') not found in gas species")
-        ih2so4 = GasSpecies.find(scenario.gases, 'h2so4')
-        if ih2so4 == -1:
-            raise ValueError("H2SO4 gas ('h2so4') not found in gas species")
-        isoag = GasSpecies.find(scenario.gases, 'soag')
-        if isoag == -1:
-            raise ValueError("SOAG gas ('soag') not found in gas species")
-        return Input(
-            mam_dt = dt,
-            mam_nstep = nstep,
-
-            mdo_gaschem = 1 if self.processes.gas_phase_chemistry else 0,
-            mdo_gasaerexch = 1 if self.processes.condensation else 0,
-            mdo_rename = 1,
-            mdo_newnuc = 1 if self.processes.nucleation else 0,
-            mdo_coag = 1 if self.processes.coagulation else 0,
-
-            temp = scenario.temperature,
-            press = scenario.pressure,
-            RH_CLEA = scenario.relative_humidity,
-
-            numc1 = scenario.size.modes[0].number,
-            numc2 = scenario.size.modes[1].number,
-            numc3 = scenario.size.modes[2].number,
-            numc4 = scenario.size.modes[3].number,
-
-            mfso41 = scenario.size.modes[0].mass_fraction("so4"),
-            mfpom1 = scenario.size.modes[0].mass_fraction("pom"),
-            mfsoa1 = scenario.size.modes[0].mass_fraction("soa"),
-            mfbc1  = scenario.size.modes[0].mass_fraction("bc"),
-            mfdst1 = scenario.size.modes[0].mass_fraction("dst"),
-            mfncl1 = scenario.size.modes[0].mass_fraction("ncl"),
-
-            mfso42 = scenario.size.modes[1].mass_fraction("so4"),
-            mfsoa2 = scenario.size.modes[1].mass_fraction("soa"),
-            mfncl2 = scenario.size.modes[1].mass_fraction("ncl"),
-
-            mfdst3 = scenario.size.modes[2].mass_fraction("dst"),
-            mfncl3 = scenario.size.modes[2].mass_fraction("ncl"),
-            mfso43 = scenario.size.modes[2].mass_fraction("so4"),
-            mfbc3  = scenario.size.modes[2].mass_fraction("bc"),
-            mfpom3 = scenario.size.modes[2].mass_fraction("pom"),
-            mfsoa3 = scenario.size.modes[2].mass_fraction("soa"),
-
-            mfpom4 = scenario.size.modes[3].mass_fraction("pom"),
-            mfbc4  = scenario.size.modes[3].mass_fraction("bc"),
-
-            qso2 = scenario.gas_concs[iso2],
-            qh2so4 = scenario.gas_concs[ih2so4],
-            qsoag = scenario.gas_concs[isoag],
-        )
+        gas_indices = _validate_input_args(scenario.size, AerosolModalSizeState,
+                                           scenario.gases, dt, nstep)
+        params = self._control_params(dt, nstep)
+        params.update({
+            'temp': scenario.temperature,
+            'press': scenario.pressure,
+            'RH_CLEA': scenario.relative_humidity,
+        })
+        for m, mode in enumerate(scenario.size.modes):
+            params[f'numc{m+1}'] = mode.number
+            mass_fractions = mode.mass_fractions
+            for name, j in zip(_MODE_SPECIES[m], _species_columns(mode, m)):
+                params[f'mf{name}{m+1}'] = mass_fractions[j]
+        for name, g in zip(_GASES, gas_indices):
+            params[f'q{name}'] = scenario.gas_concs[g]
+        return Input(**params)
+
+    def create_inputs(self,
+                      ensemble: Ensemble,
+                      dt: float,
+                      nstep: int) -> list[Input]:
+        """ambrs.mam4.AerosolModel.create_inputs(ensemble, dt, nstep) -> list of
+ambrs.mam4.Input objects that can create input files for an entire ensemble
+
+Parameters:
+    * ensemble: a ppe.Ensemble object created by sampling a modal particle size
+      distribution
+    * dt: a fixed time step size for simulations
+    * nsteps: the number of steps in each simulation
+
+Species and gases are looked up once for the whole ensemble, and the inputs are
+assembled from columns of the ensemble's arrays."""
+        gas_indices = _validate_input_args(ensemble.size, AerosolModalSizePopulation,
+                                           ensemble.gases, dt, nstep)
+        columns = {
+            'temp': ensemble.temperature,
+            'RH_CLEA': ensemble.relative_humidity,
+        }
+        for name, g in zip(_GASES, gas_indices):
+            columns[f'q{name}'] = ensemble.gas_concs[g]
+        for m, mode in enumerate(ensemble.size.modes):
+            columns[f'numc{m+1}'] = mode.number
+            mass_fractions = mode.mass_fractions_matrix[:, _species_columns(mode, m)]
+            for j, name in enumerate(_MODE_SPECIES[m]):
+                columns[f'mf{name}{m+1}'] = mass_fractions[:, j]
+
+        columns = {name: np.asarray(column).tolist() for name, column in columns.items()}
+        params = self._control_params(dt, nstep)
+        params['press'] = ensemble.pressure
+        return [
+            Input(**params, **{name: column[i] for name, column in columns.items()})
+            for i in range(len(ensemble))
+        ]
 
     def invocation(self, exe: str, prefix: str) -> str:
         """input.invocation(exe, prefix) -> a string defining the command invoking
@@ -167,60 +268,9 @@ working directory contains any needed input files."""
         pass
 
     def write_input_files(self, input, dir, prefix) -> None:
-        content = f"""! generated by ambrs.mam4.AerosolModel.write_input_files
-&time_input
-  mam_dt         = {input.mam_dt},
-  mam_nstep      = {input.mam_nstep},
-/
-&cntl_input
-  mdo_gaschem    = {input.mdo_gaschem},
-  mdo_gasaerexch = {input.mdo_gasaerexch},
-  mdo_rename     = {input.mdo_rename},
-  mdo_newnuc     = {input.mdo_newnuc},
-  mdo_coag       = {input.mdo_coag},
-/
-&met_input
-  temp           = {input.temp},
-  press          = {input.press},
-  RH_CLEA        = {input.RH_CLEA},
-/
-&chem_input
-  numc1          = {input.numc1}, ! unit: #/m3
-  numc2          = {input.numc2},
-  numc3          = {input.numc3},
-  numc4          = {input.numc4},
-  !
-  ! mfABCx: mass fraction of species ABC in mode x.
-  ! 
-  ! The mass fraction of mom is calculated by
-  ! 1 - sum(mfABCx). If sum(mfABCx) > 1, an error
-  ! is issued by the test driver. number of species
-  ! ABC in each mode x comes from the MAM4 with mom.
-  ! 
-  mfso41         = {input.mfso41},
-  mfpom1         = {input.mfpom1},
-  mfsoa1         = {input.mfsoa1},
-  mfbc1          = {input.mfbc1},
-  mfdst1         = {input.mfdst1},
-  mfncl1         = {input.mfncl1},
-  mfso42         = {input.mfso42},
-  mfsoa2         = {input.mfsoa2},
-  mfncl2         = {input.mfncl2},
-  mfdst3         = {input.mfdst3},
-  mfncl3         = {input.mfncl3},
-  mfso43         = {input.mfso43},
-  mfbc3          = {input.mfbc3},
-  mfpom3         = {input.mfpom3},
-  mfsoa3         = {input.mfsoa3},
-  mfpom4         = {input.mfpom4},
-  mfbc4          = {input.mfbc4},
-  qso2           = {input.qso2},
-  qh2so4         = {input.qh2so4},
-  qsoag          = {input.qsoag},
-/
-"""
         if not os.path.exists(dir):
             raise OSError(f'Directory not found: {dir}')
+        content = _NAMELIST_TEMPLATE.format_map(vars(input))
         filename = os.path.join(dir, 'namelist')
         with open(filename, 'w') as f:
             f.write(content)
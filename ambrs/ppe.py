@@ -3,21 +3,24 @@ ensembles (PPE).
 
 We use frozen scipy.stats distributions (specifically the rv_continuous ones)
 for sampling. These frozen distributions fix the shape parameters, location, and
-scale factors for each random variable.
+scale factors for each random variable. The lightweight ambrs.Uniform and
+ambrs.LogUniform distributions can be used in their place.
 """
 
 import numpy as np
 import pyDOE
 import scipy.stats
-import itertools # for cartesian products of parameter sweeps
+import scipy.stats.qmc
 
-from dataclasses import dataclass
-from math import log10, pow
+from dataclasses import dataclass, field
+from math import log10, prod
 from typing import Optional
+from ._sampling_kernels import fill_mode
 from .aerosol import \
-    AerosolModalSizeState, AerosolModeState, AerosolModePopulation, \
+    AerosolModalSizeState, AerosolModePopulation, \
     AerosolModalSizeDistribution, AerosolModalSizePopulation, AerosolSpecies, \
-    RVFrozenDistribution
+    AerosolModalSizeStateView, Distribution, _SampledParameter, \
+    _reduce_member, _sampled_parameter, species_indices
 from .gas import GasSpecies
 from .scenario import Scenario
 
@@ -29,13 +32,38 @@ PPE are sampled"""
     aerosols: tuple[AerosolSpecies, ...]
     gases: tuple[GasSpecies, ...]
     size: AerosolModalSizeDistribution
-    gas_concs: tuple[RVFrozenDistribution, ...] # ordered like gases
-    flux: RVFrozenDistribution
-    relative_humidity: RVFrozenDistribution
-    temperature: RVFrozenDistribution
+    gas_concs: tuple[Distribution, ...] # ordered like gases
+    flux: Distribution
+    relative_humidity: Distribution
+    temperature: Distribution
     pressure: float # <-- these are fixed per ensemble
     height: float   # <--
 
+    # flattened sampled parameters, ordered by mode, then gas_concs, flux,
+    # relative_humidity, temperature, and the indices of those that aren't fixed
+    _flat_params: tuple[_SampledParameter, ...] = field(init=False, repr=False, compare=False)
+    _random_params: np.array = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # gas_concs may be given as any iterable, so we make sure it's a tuple
+        object.__setattr__(self, 'gas_concs', tuple(self.gas_concs))
+        params = []
+        if isinstance(self.size, AerosolModalSizeDistribution):
+            for mode in self.size.modes:
+                params.extend(mode._flat_params)
+        params.extend([
+            _sampled_parameter(f'gas_concs[{g}]', gas_conc)
+            for g, gas_conc in enumerate(self.gas_concs)
+        ])
+        params.extend([
+            _sampled_parameter('flux', self.flux),
+            _sampled_parameter('relative_humidity', self.relative_humidity),
+            _sampled_parameter('temperature', self.temperature),
+        ])
+        object.__setattr__(self, '_flat_params', tuple(params))
+        object.__setattr__(self, '_random_params',
+            np.array([j for j, p in enumerate(params) if not p.is_fixed], dtype = np.intp))
+
 @dataclass(frozen=True)
 class Ensemble:
     """Ensemble: an ensemble defined by values sampled from the distributions of
@@ -51,12 +79,23 @@ a specific EnsembleSpecification"""
     height: float
     specification: Optional[EnsembleSpecification] = None # if used for creation
 
+    # for each mode, the indices within aerosols of the mode's species, ordered
+    # like the columns of its mass fractions
+    species_idx: tuple[np.array, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        species_idx = ()
+        if isinstance(self.size, AerosolModalSizePopulation):
+            species_idx = tuple([species_indices(self.aerosols, mode.species)
+                                 for mode in self.size.modes])
+        object.__setattr__(self, 'species_idx', species_idx)
+
     def __len__(self):
         return len(self.size)
 
     def __iter__(self):
         for i in range(len(self)):
-            yield self.member(i)
+            yield ScenarioView(self, i)
 
     def member(self, i: int) -> Scenario:
         """ensemble.member(i) -> extracts Scenario from ith ensemble member"""
@@ -72,6 +111,67 @@ a specific EnsembleSpecification"""
             height = self.height,
         )
 
+class ScenarioView(Scenario):
+    """ScenarioView: a read-only view of the ith member of an Ensemble, which
+reads its state from the ensemble's arrays on first access (use
+ensemble.member(i), copy.copy, or copy.deepcopy to get a modifiable copy, which
+is also what a pickled view unpickles as)"""
+
+    def __init__(self, ensemble: Ensemble, i: int):
+        self._ensemble = ensemble
+        self._i = i
+        self._size = None      # view of the member's size, created on first access
+        self._gas_concs = None # member's gas concentrations, read on first access
+
+    def __copy__(self) -> Scenario:
+        return self._ensemble.member(self._i)
+
+    def __deepcopy__(self, memo) -> Scenario:
+        return self._ensemble.member(self._i)
+
+    def __reduce__(self):
+        return _reduce_member(self._ensemble.member(self._i))
+
+    @property
+    def aerosols(self) -> tuple[AerosolSpecies, ...]:
+        return self._ensemble.aerosols
+
+    @property
+    def gases(self) -> tuple[GasSpecies, ...]:
+        return self._ensemble.gases
+
+    @property
+    def size(self) -> AerosolModalSizeState:
+        if self._size is None:
+            self._size = AerosolModalSizeStateView(self._ensemble.size, self._i)
+        return self._size
+
+    @property
+    def gas_concs(self) -> tuple[float, ...]:
+        if self._gas_concs is None:
+            self._gas_concs = tuple([float(conc[self._i]) for conc in self._ensemble.gas_concs])
+        return self._gas_concs
+
+    @property
+    def flux(self) -> float:
+        return float(self._ensemble.flux[self._i])
+
+    @property
+    def relative_humidity(self) -> float:
+        return float(self._ensemble.relative_humidity[self._i])
+
+    @property
+    def temperature(self) -> float:
+        return float(self._ensemble.temperature[self._i])
+
+    @property
+    def pressure(self) -> float:
+        return self._ensemble.pressure
+
+    @property
+    def height(self) -> float:
+        return self._ensemble.height
+
 #------------------------------------------------
 # Ensembles constructed by aggregating scenarios
 #------------------------------------------------
@@ -83,48 +183,52 @@ specified scenarios (which must all have the same particle size representation)"
     if n == 0:
         raise ValueError("No scenarios provided for ensemble!")
 
-    # assemble size-independent data
-    flux = np.array([scenario.flux for scenario in scenarios])
-    relative_humidity = np.array([scenario.relative_humidity for scenario in scenarios])
-    temperature = np.array([scenario.temperature for scenario in scenarios])
+    # if every member is the same scenario, we can simply replicate its data
+    identical = all([scenario is scenarios[0] for scenario in scenarios])
+
+    def stack(values) -> np.array:
+        """stack(values) -> (n, m) array whose ith row holds the m values
+returned by values(scenarios[i])"""
+        if identical:
+            row = np.array(values(scenarios[0]), dtype = np.float64)
+            return np.tile(row, (n, 1))
+        return np.array([values(scenario) for scenario in scenarios],
+                        dtype = np.float64)
+
+    # assemble size-independent data in a single pass
+    num_gases = len(scenarios[0].gas_concs)
+    state = stack(lambda scenario: (*scenario.gas_concs, scenario.flux,
+                                    scenario.relative_humidity, scenario.temperature))
 
     # handle particle size data
     size = None
     if isinstance(scenarios[0].size, AerosolModalSizeState):
         modes=[]
         for m, mode in enumerate(scenarios[0].size.modes):
-            num_species = len(mode.species)
-            modes.append(AerosolModePopulation(
+            # assemble all population data for this mode in a single array
+            data = stack(lambda scenario: (
+                scenario.size.modes[m].number,
+                scenario.size.modes[m].geom_mean_diam,
+                scenario.size.modes[m].log10_geom_std_dev,
+                *scenario.size.modes[m].mass_fractions))
+            modes.append(AerosolModePopulation.from_array(
                 name = mode.name,
                 species = mode.species,
-                number = np.array([scenario.size.modes[m].number \
-                                   for scenario in scenarios]),
-                geom_mean_diam = np.array([scenario.size.modes[m].geom_mean_diam \
-                                           for scenario in scenarios]),
-                log10_geom_std_dev = np.array([scenario.size.modes[m].log10_geom_std_dev \
-                                              for scenario in scenarios]),
-                mass_fractions = tuple(
-                    [np.array([scenario.size.modes[m].mass_fractions[s] \
-                               for scenario in scenarios]) \
-                               for s in range(num_species)]
-                ),
+                data = data,
             ))
         size = AerosolModalSizePopulation(
             modes = tuple(modes),
         )
     else:
         raise TypeError("Invalid particle size information in scenarios!")
-    gas_concs = []
-    for g in range(len(scenarios[0].gas_concs)):
-        gas_concs.append(np.array([scenario.gas_concs[g] for scenario in scenarios]))
     return Ensemble(
         aerosols = scenarios[0].aerosols,
         gases = scenarios[0].gases,
         size = size,
-        gas_concs = tuple(gas_concs),
-        flux = flux,
-        relative_humidity = relative_humidity,
-        temperature = temperature,
+        gas_concs = tuple([state[:,g] for g in range(num_gases)]),
+        flux = state[:,num_gases],
+        relative_humidity = state[:,num_gases+1],
+        temperature = state[:,num_gases+2],
         pressure = scenarios[0].pressure,
         height = scenarios[0].height,
     )
@@ -133,90 +237,143 @@ specified scenarios (which must all have the same particle size representation)"
 # Ensembles constructed by sampling distributions
 #-------------------------------------------------
 
-def sample(specification: EnsembleSpecification, n: int) -> Ensemble:
-    """sample(spec, n) -> n-member ensemble sampled from a specification"""
+def _closed_form_bounds(params: tuple[_SampledParameter, ...]) -> tuple[np.array, np.array, np.array]:
+    """_closed_form_bounds(params) -> (lows, highs, is_log) arrays for the given
+closed-form sampled parameters, with the bounds of loguniform parameters given
+in terms of their natural logarithms"""
+    is_log = np.array([p.is_log for p in params])
+    lows = np.array([p.lo for p in params], dtype = np.float64)
+    highs = np.array([p.hi for p in params], dtype = np.float64)
+    np.log(lows, where = is_log, out = lows)
+    np.log(highs, where = is_log, out = highs)
+    return lows, highs, is_log
+
+def _ppf_columns(params: tuple[_SampledParameter, ...],
+                 u: np.array,
+                 out: Optional[np.array] = None) -> np.array:
+    """_ppf_columns(params, u, [out]) -> 2D array whose jth column is the inverse
+CDF of the distribution of params[j] evaluated at the quantiles in u[:,j]. If
+given, out holds the result (and may be u itself)."""
+    x = np.empty_like(u) if out is None else out
+    columns = {} # columns sharing each closed-form inverse CDF
+    for j, p in enumerate(params):
+        if p.ppf:
+            columns.setdefault(p.ppf, []).append(j)
+        else: # fall back to scipy for distributions without closed forms
+            x[:,j] = p.dist.ppf(u[:,j])
+    for ppf, cols in columns.items():
+        lo = np.array([params[j].lo for j in cols])
+        hi = np.array([params[j].hi for j in cols])
+        x[:,cols] = ppf(u[:,cols], lo, hi)
+    return x
+
+def _ensemble_from_quantiles(specification: EnsembleSpecification,
+                             u: np.array) -> Ensemble:
+    """_ensemble_from_quantiles(specification, u) -> ensemble whose members
+take the values of the specification's distributions at the quantiles u, a 2D
+array with indices (sample index, parameter index) ordered like the
+specification's flattened sampled parameters. The quantiles are mapped to
+parameter values in place, so the ensemble's arrays are views into u."""
+    params = specification._flat_params
     size = None
+    f = 0 # parameter index
     if isinstance(specification.size, AerosolModalSizeDistribution):
-        size = AerosolModalSizePopulation(
-            modes=tuple([
-                AerosolModePopulation(
-                    name = mode.name,
-                    species = mode.species,
-                    number = mode.number.rvs(n),
-                    geom_mean_diam = mode.geom_mean_diam.rvs(n),
-                    log10_geom_std_dev = np.array([mode.log10_geom_std_dev for i in range(n)]),
-                    mass_fractions = tuple([f.rvs(n) for f in mode.mass_fractions]),
-                ) for mode in specification.size.modes]),
-        )
-        # normalize mass fractions
-        for mode in size.modes:
-            factor = sum([mass_fraction for mass_fraction in mode.mass_fractions])
-            mode.mass_fractions = tuple([mf/factor for mf in mode.mass_fractions])
+        modes = []
+        for mode in specification.size.modes:
+            num_params = len(mode._flat_params)
+            data = u[:,f:f+num_params]
+            population = AerosolModePopulation.from_array(
+                name = mode.name,
+                species = mode.species,
+                data = data,
+            )
+            if all([p.ppf for p in mode._flat_params]):
+                # map and normalize in a single pass
+                lows, highs, is_log = _closed_form_bounds(mode._flat_params)
+                fill_mode(data, lows, highs, is_log, data)
+            else:
+                _ppf_columns(mode._flat_params, data, out = data)
+                population.normalize_mass_fractions()
+            modes.append(population)
+            f += num_params
+        size = AerosolModalSizePopulation(modes = tuple(modes))
+    values = _ppf_columns(params[f:], u[:,f:], out = u[:,f:])
+    num_gases = len(specification.gas_concs)
+    gas_concs = tuple([values[:,g] for g in range(num_gases)])
     return Ensemble(
         aerosols = specification.aerosols,
         gases = specification.gases,
         specification = specification,
         size = size,
-        gas_concs = tuple([gas_conc.rvs(n) for gas_conc in specification.gas_concs]),
-        flux = specification.flux.rvs(n),
-        relative_humidity = specification.relative_humidity.rvs(n),
-        temperature = specification.temperature.rvs(n),
+        gas_concs = gas_concs,
+        flux = values[:,num_gases],
+        relative_humidity = values[:,num_gases+1],
+        temperature = values[:,num_gases+2],
         pressure = specification.pressure,
         height = specification.height,
     )
 
+def sample(specification: EnsembleSpecification,
+           n: int,
+           *,
+           rng = None) -> Ensemble:
+    """sample(spec, n, [rng = rng]) -> n-member ensemble sampled from a
+specification. The optional (keyword-only) rng argument is a
+numpy.random.Generator or a seed from which one is created with
+numpy.random.default_rng."""
+    rng = np.random.default_rng(rng)
+    # all sampled parameters share a single buffer, filled with quantiles in a
+    # single draw (fixed parameters take their values at any quantile)
+    u = np.empty((n, len(specification._flat_params)))
+    rng.random(out = u)
+    return _ensemble_from_quantiles(specification, u)
+
+# latin hypercube criteria supported by scipy.stats.qmc.LatinHypercube, mapped to
+# the corresponding engine options (all other criteria are handed to pyDOE)
+_QMC_LHS_CRITERIA = {
+    None:        {},
+    'center':    {'scramble': False},
+    'c':         {'scramble': False},
+    'random-cd': {'optimization': 'random-cd'},
+    'lloyd':     {'optimization': 'lloyd'},
+}
+
 def lhs(specification: EnsembleSpecification,
         n: int,
         criterion = None,
-        iterations = None) -> Ensemble:
-    """lhs(specification, n, [criterion, iterations]) -> n-member ensemble
+        iterations = None,
+        *,
+        rng = None) -> Ensemble:
+    """lhs(specification, n, [criterion, iterations, rng = rng]) -> n-member ensemble
 generated from latin hypercube sampling applied to the given specification. The
-optional arguments are passed along to pyDOE's lhs function, which creates the
-distribution from which ensemble members are sampled."""
-    num_gases = len(specification.gases)
-    n_factors = num_gases + 3 # size-independent factors: num_gases + flux + relative_humidity + temperature
-    lhd = None # latin hypercube distribution (created depending on particle
-               # size representation)
-    size = None
-    if isinstance(specification.size, AerosolModalSizeDistribution):
-        # count up mode-related factors
-        for mode in specification.size.modes:
-            n_factors += 2 + len(mode.mass_fractions)
-        # lhd is a 2D array with indices (sample index, factor index)
+latin hypercube is created by scipy.stats.qmc.LatinHypercube, which supports
+the following (optional) criteria:
+    * 'center' or 'c': samples the center of each interval
+    * 'random-cd': optimizes the centered discrepancy of the design
+    * 'lloyd': optimizes the design with Lloyd-Max iterations
+Any other criterion (e.g. 'maximin' or 'correlation') is passed along with
+iterations to pyDOE's lhs function. The optional (keyword-only) rng argument
+is a numpy.random.Generator or a seed from which one is created with
+numpy.random.default_rng. pyDOE draws from numpy's global random state instead,
+so rng can't be given with pyDOE's criteria (a ValueError is thrown)."""
+    if criterion not in _QMC_LHS_CRITERIA and rng is not None:
+        raise ValueError(f"rng can't be used with pyDOE's '{criterion}' criterion")
+    rng = np.random.default_rng(rng)
+    random_params = specification._random_params
+    n_factors = len(random_params)
+
+    # lhd is a 2D array with indices (sample index, factor index)
+    if criterion in _QMC_LHS_CRITERIA:
+        engine = scipy.stats.qmc.LatinHypercube(d = n_factors, seed = rng,
+                                                **_QMC_LHS_CRITERIA[criterion])
+        lhd = engine.random(n)
+    else:
         lhd = pyDOE.lhs(n_factors, n, criterion, iterations)
-        num_species = [len(mode.mass_fractions) for mode in specification.size.modes]
-        size = AerosolModalSizePopulation(
-            modes=tuple([
-                AerosolModePopulation(
-                    name = mode.name,
-                    species = mode.species,
-                    number=mode.number.ppf(lhd[:,(2+num_species[m])*m]),
-                    geom_mean_diam=mode.geom_mean_diam.ppf(lhd[:,(2+num_species[m])*m+1]),
-                    log10_geom_std_dev = np.array([mode.log10_geom_std_dev for i in range(n)]),
-                    mass_fractions=tuple(
-                        [mass_fraction.ppf(lhd[:,(2+num_species[m])*m+f])
-                         for f, mass_fraction in enumerate(mode.mass_fractions)]),
-                ) for m, mode in enumerate(specification.size.modes)]),
-        )
-        # normalize mass fractions
-        for mode in size.modes:
-            factor = sum([mass_fraction for mass_fraction in mode.mass_fractions])
-            mode.mass_fractions = tuple([mf/factor for mf in mode.mass_fractions])
-    gas_concs = []
-    for g, gas_conc in enumerate(specification.gas_concs):
-        gas_concs.append(gas_conc.ppf(lhd[:,-3-(num_gases-g)]))
-    return Ensemble(
-        aerosols = specification.aerosols,
-        gases = specification.gases,
-        specification = specification,
-        size = size,
-        gas_concs = tuple(gas_concs),
-        flux = specification.flux.ppf(lhd[:,-3]),
-        relative_humidity = specification.relative_humidity.ppf(lhd[:,-2]),
-        temperature = specification.temperature.ppf(lhd[:,-1]),
-        pressure = specification.pressure,
-        height = specification.height,
-    )
+
+    # fixed parameters take their values at any quantile
+    u = np.zeros((n, len(specification._flat_params)))
+    u[:,random_params] = lhd
+    return _ensemble_from_quantiles(specification, u)
 
 #---------------------------
 # Swept-parameter ensembles
@@ -234,10 +391,12 @@ parameter range [a, b]"""
         return self.n
 
     def __iter__(self) -> float: # `for p in sweep` allows iteration over assumed values
+        yield from self.values().tolist()
+
+    def values(self) -> np.array:
+        """sweep.values() -> array of all values assumed by the sweep"""
         assert(self.b - self.a > 0)
-        step = (self.b - self.a)/self.n
-        for i in range(self.n):
-            yield self.a + i*step
+        return np.linspace(self.a, self.b, self.n, endpoint = False)
 
 @dataclass(frozen=True)
 class LogarithmicParameterSweep:
@@ -251,12 +410,12 @@ parameter range [a, b]"""
         return self.n
 
     def __iter__(self) -> float: # allows iteration over assumed values
+        yield from self.values().tolist()
+
+    def values(self) -> np.array:
+        """sweep.values() -> array of all values assumed by the sweep"""
         assert(self.b - self.a > 0)
-        log_a = log10(self.a)
-        log_b = log10(self.b)
-        step = (log_b - log_a)/self.n
-        for i in range(self.n):
-            yield pow(10, log_a + i*step)
+        return np.logspace(log10(self.a), log10(self.b), self.n, endpoint = False)
 
 @dataclass(frozen=True)
 class AerosolModeParameterSweeps:
@@ -298,28 +457,40 @@ def modal_size_factors(ref_size: AerosolModalSizeState,
     """Returns a list of numpy arrays containing all values assumed by
 modal parameter sweeps for every mode in a modal particle size description.
 These arrays represent "factors" in the cartesian product representing all
-possible combinations of parameters."""
+possible combinations of parameters, and are ordered like the columns of each
+mode's AerosolModePopulation data array."""
     factors = []
     for m, mode in enumerate(ref_size.modes):
-        if sweeps and sweeps.modes and sweeps.modes[m] and sweeps.modes[m].number:
-            numbers = [n for n in sweeps.modes[m].number]
+        mode_sweeps = sweeps.modes[m] if sweeps and sweeps.modes else None
+        if mode_sweeps and mode_sweeps.number:
+            factors.append(mode_sweeps.number.values())
         else:
-            numbers = [ref_size.modes[m].number]
-        factors.append(numbers)
-        if sweeps and sweeps.modes and sweeps.modes[m] and sweeps.modes[m].geom_mean_diam:
-            diameters = [d for d in sweeps.modes[m].geom_mean_diam]
+            factors.append(np.array([mode.number]))
+        if mode_sweeps and mode_sweeps.geom_mean_diam:
+            factors.append(mode_sweeps.geom_mean_diam.values())
         else:
-            diameters = [ref_size.modes[m].geom_mean_diam]
-        factors.append(diameters)
-        if sweeps and sweeps.modes and sweeps.modes[m] and sweeps.modes[m].mass_fractions:
-            for mf in sweeps.modes[m].mass_fractions:
-                mass_fracs = [f for f in mf]
-                factors.append(mass_fracs)
+            factors.append(np.array([mode.geom_mean_diam]))
+        factors.append(np.array([mode.log10_geom_std_dev]))
+        if mode_sweeps and mode_sweeps.mass_fractions:
+            for mf in mode_sweeps.mass_fractions:
+                factors.append(mf.values())
         else:
-            for mf in ref_size.modes[m].mass_fractions:
-                factors.append([mf])
+            for mf in mode.mass_fractions:
+                factors.append(np.array([mf]))
     return factors
 
+def _cartesian_product(factors: list[np.array]) -> np.array:
+    """_cartesian_product(factors) -> 2D array with indices (member index, factor
+index) whose rows hold all combinations of values in the given factors, ordered
+like itertools.product(*factors) (i.e. with the last factor varying fastest)"""
+    n = prod([len(factor) for factor in factors])
+    product = np.empty((n, len(factors)))
+    repeats = n # number of consecutive rows sharing each value of a factor
+    for f, factor in enumerate(factors):
+        repeats //= len(factor)
+        product[:,f] = np.tile(np.repeat(factor, repeats), n // (len(factor) * repeats))
+    return product
+
 def sweep(reference_state: Scenario, sweeps: AerosolParameterSweeps) -> Ensemble:
     """sweep(reference_state, sweeps) -> ensemble generated by initializing a
 "reference state" and performing sweeps for the parameters specified in the
@@ -336,66 +507,50 @@ parameter sweeps"""
         raise TypeError(f'sweep: Unsupported particle size representation: {reference_state.size.__class__}')
     if sweeps.gas_concs:
         for gas_conc in sweeps.gas_concs:
-            factors.append([c for c in gas_conc])
+            factors.append(gas_conc.values())
     else:
         for c in range(len(reference_state.gas_concs)):
-            factors.append([reference_state.gas_concs[c]])
+            factors.append(np.array([reference_state.gas_concs[c]]))
     if sweeps.flux:
-        factors.append([F for F in sweeps.flux])
+        factors.append(sweeps.flux.values())
     else:
-        factors.append([reference_state.flux])
+        factors.append(np.array([reference_state.flux]))
     if sweeps.relative_humidity:
-        factors.append([rh for rh in sweeps.relative_humidity])
+        factors.append(sweeps.relative_humidity.values())
     else:
-        factors.append([reference_state.relative_humidity])
+        factors.append(np.array([reference_state.relative_humidity]))
     if sweeps.temperature:
-        factors.append([T for T in sweeps.temperature])
+        factors.append(sweeps.temperature.values())
     else:
-        factors.append([reference_state.temperature])
+        factors.append(np.array([reference_state.temperature]))
 
     # form all parameter combinations to populate an ensemble
-    all_params = list(itertools.product(*factors))
-    members = []
-    for params in all_params:
-        index = 0
-        size = None
-        if isinstance(reference_state.size, AerosolModalSizeState):
-            mode_states = []
-            for mode in reference_state.size.modes:
-                num_species = len(mode.species)
-                mass_fractions = [params[index+2+s] for s in range(num_species)]
-                mode_states.append(
-                    AerosolModeState(
-                        name = mode.name,
-                        species = mode.species,
-                        number = params[index],
-                        geom_mean_diam = params[index+1],
-                        log10_geom_std_dev = mode.log10_geom_std_dev,
-                        mass_fractions = tuple(mass_fractions),
-                    ),
-                )
-                index += 2 + num_species
-            size = AerosolModalSizeState(
-                modes = mode_states,
-            )
-        else:
-            raise TypeError(f'Unsupported particle size state: {reference_state.size.__class__}')
-        gas_concs = []
-        for g in range(len(reference_state.gas_concs)):
-            gas_concs.append(params[index + g])
-        index += len(gas_concs)
-        member = Scenario(
-            aerosols = reference_state.aerosols,
-            gases = reference_state.gases,
-            size = size,
-            gas_concs = tuple(gas_concs),
-            flux = params[index],
-            relative_humidity = params[index + 1],
-            temperature = params[index + 2],
-            pressure = reference_state.pressure,
-            height = reference_state.height,
-        )
-        index += 3
-        members.append(member)
+    params = _cartesian_product(factors)
 
-    return ensemble_from_scenarios(members)
+    index = 0
+    size = None
+    if isinstance(reference_state.size, AerosolModalSizeState):
+        modes = []
+        for mode in reference_state.size.modes:
+            num_params = 3 + len(mode.mass_fractions)
+            modes.append(AerosolModePopulation.from_array(
+                name = mode.name,
+                species = mode.species,
+                data = np.ascontiguousarray(params[:,index:index+num_params]),
+            ))
+            index += num_params
+        size = AerosolModalSizePopulation(modes = tuple(modes))
+    else:
+        raise TypeError(f'Unsupported particle size state: {reference_state.size.__class__}')
+    num_gases = len(reference_state.gas_concs)
+    return Ensemble(
+        aerosols = reference_state.aerosols,
+        gases = reference_state.gases,
+        size = size,
+        gas_concs = tuple([params[:,index+g] for g in range(num_gases)]),
+        flux = params[:,index+num_gases],
+        relative_humidity = params[:,index+num_gases+1],
+        temperature = params[:,index+num_gases+2],
+        pressure = reference_state.pressure,
+        height = reference_state.height,
+    )
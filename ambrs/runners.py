@@ -1,9 +1,9 @@
 """ambrs.runners -- data types and functions related to running scenarios"""
 
+import concurrent.futures
 import logging
 import math
 import multiprocessing
-import multiprocessing.dummy
 import os
 import subprocess
 
@@ -56,6 +56,7 @@ runner's root directory, generating a directory for each of the scenarios"""
         logger.info(f'{model_name}: generating input for {num_inputs} scenarios...')
         found_dir = False
         args = []
+        dirs, scenario_names = [], []
         for i, input in enumerate(inputs):
 
             # zero-pad the 1-based scenario index
@@ -70,43 +71,43 @@ runner's root directory, generating a directory for each of the scenarios"""
             else:
                 os.mkdir(dir)
 
-            # write input files and define commands
-            self.model.write_input_files(input, dir, scenario_name)
+            # define commands
             command = self.model.invocation(self.executable, scenario_name)
-            dir = os.path.join(self.root, scenario_name)
             args.append({
                 'command': command,
                 'dir': dir
             })
+            dirs.append(dir)
+            scenario_names.append(scenario_name)
+
+        # write input files. This is dominated by file I/O, which releases the
+        # GIL, so a pool of threads overlaps the writes.
+        with concurrent.futures.ThreadPoolExecutor(max_workers = self.num_processes) as executor:
+            list(executor.map(self.model.write_input_files, inputs, dirs, scenario_names))
         if found_dir:
             logger.warning(f'{model_name}: one or more existing scenario directories found. Overwriting contents...')
         logger.info(f'{model_name}: finished generating scenario input.')
 
-        # now run scenarios in parallel
-        pool = multiprocessing.dummy.Pool(self.num_processes)
+        # now run scenarios in parallel. Each scenario runs in its own external
+        # process, so a pool of threads that wait on these processes is all we
+        # need to keep num_processes of them running at once.
         logger.info(f'{model_name}: running {num_inputs} inputs ({self.num_processes} parallel processes)')
 
-        error_occurred = False
-
-        # this function is called with a list of completed processes by pool.map_async
-        def callback(completed_processes) -> None:
-            if not all([p.returncode == 0 for p in completed_processes]):
-                error_occurred = True
-
-        # this function is called with one of a mapped set of arguments by pool.map_async
+        # this function is called with one of a mapped set of arguments by the executor
         def run_scenario(args) -> subprocess.CompletedProcess:
-            f_stdout = open(os.path.join(args['dir'], 'stdout.log'), 'w')
-            f_stderr = open(os.path.join(args['dir'], 'stderr.log'), 'w')
-            return subprocess.run(args['command'].split(),
-                close_fds = True,
-                cwd = args['dir'],
-                stdout = f_stdout,
-                stderr = f_stderr,
-            )
-
-        results = pool.map_async(run_scenario, args, callback = callback)
-        results.wait()
+            with open(os.path.join(args['dir'], 'stdout.log'), 'w') as f_stdout, \
+                 open(os.path.join(args['dir'], 'stderr.log'), 'w') as f_stderr:
+                return subprocess.run(args['command'].split(),
+                    close_fds = True,
+                    cwd = args['dir'],
+                    stdin = subprocess.DEVNULL,
+                    stdout = f_stdout,
+                    stderr = f_stderr,
+                )
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers = self.num_processes) as executor:
+            completed_processes = list(executor.map(run_scenario, args))
 
         logger.info(f'{model_name}: completed runs.')
-        if error_occurred:
-            logger.error('f{model_name}: At least one run failed.')
+        if not all([p.returncode == 0 for p in completed_processes]):
+            logger.error(f'{model_name}: At least one run failed.')
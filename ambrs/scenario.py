@@ -21,3 +21,18 @@ in terms of state information"""
     pressure: float
     height: float
 
+    def __eq__(self, other) -> bool:
+        # compare scalars before sequences, and the size state last
+        if self is other:
+            return True
+        if not isinstance(other, Scenario):
+            return NotImplemented
+        return self.temperature == other.temperature and \
+               self.relative_humidity == other.relative_humidity and \
+               self.flux == other.flux and \
+               self.pressure == other.pressure and \
+               self.height == other.height and \
+               tuple(self.gas_concs) == tuple(other.gas_concs) and \
+               tuple(self.gases) == tuple(other.gases) and \
+               tuple(self.aerosols) == tuple(other.aerosols) and \
+               self.size == other.size
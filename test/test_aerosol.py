@@ -3,6 +3,7 @@
 import ambrs.aerosol as aerosol
 from math import log10
 import numpy as np
+import pickle
 import unittest
 
 so4 = aerosol.AerosolSpecies(
@@ -39,6 +40,27 @@ class TestAerosolModeState(unittest.TestCase):
         self.assertEqual(0.3, self.mode_state.mass_fraction('soa'))
         self.assertEqual(0.3, self.mode_state.mass_fraction('ncl'))
 
+    def test_equality(self):
+        self.assertEqual(self.mode_state, self.mode_state)
+        other = aerosol.AerosolModeState(
+            name = "aitken",
+            species = (so4, soa, ncl),
+            number = 5e8,
+            geom_mean_diam = 1e-7,
+            log10_geom_std_dev = log10(1.6),
+            mass_fractions = [0.4, 0.3, 0.3],
+        )
+        self.assertEqual(self.mode_state, other) # sequence types don't matter
+        other.number = 6e8
+        self.assertNotEqual(self.mode_state, other)
+        other.number = 5e8
+        other.mass_fractions = (0.3, 0.4, 0.3)
+        self.assertNotEqual(self.mode_state, other)
+        other.mass_fractions = (0.4, 0.3, 0.3)
+        other.species = (so4, ncl, soa)
+        self.assertNotEqual(self.mode_state, other)
+        self.assertNotEqual(self.mode_state, 'aitken')
+
 class TestAerosolModePopulation(unittest.TestCase):
     """Unit tests for ambr.aerosol.AerosolModePopulation"""
 
@@ -72,10 +94,48 @@ class TestAerosolModePopulation(unittest.TestCase):
         for state in self.mode_population:
             self.assertEqual(self.ref_state, state)
 
+        # pickled views unpickle as members
+        state = pickle.loads(pickle.dumps(next(iter(self.mode_population))))
+        self.assertIs(aerosol.AerosolModeState, type(state))
+        self.assertEqual(self.ref_state, state)
+
     def test_member(self):
         for i in range(self.n):
             self.assertEqual(self.ref_state, self.mode_population.member(i))
 
+    def test_from_array(self):
+        data = np.tile([5e8, 1e-7, log10(1.6), 0.4, 0.3, 0.3], (self.n, 1))
+        population = aerosol.AerosolModePopulation.from_array(
+            name = self.ref_state.name,
+            species = self.ref_state.species,
+            data = data,
+        )
+        self.assertEqual(self.n, len(population))
+        for state in population:
+            self.assertEqual(self.ref_state, state)
+        # fields are views into the given array
+        population.number[:] = 1e9
+        self.assertTrue(np.all(data[:,0] == 1e9))
+        with self.assertRaises(ValueError):
+            aerosol.AerosolModePopulation.from_array(
+                name = self.ref_state.name,
+                species = self.ref_state.species,
+                data = data[:,:-1],
+            )
+
+    def test_normalize_mass_fractions(self):
+        self.mode_population.mass_fractions = (
+            np.full(self.n, 2.0), np.full(self.n, 1.0), np.full(self.n, 1.0))
+        self.mode_population.normalize_mass_fractions()
+        for state in self.mode_population:
+            self.assertEqual((0.5, 0.25, 0.25), state.mass_fractions)
+
+    def test_mass_fractions_matrix(self):
+        mass_fractions = self.mode_population.mass_fractions_matrix
+        self.assertEqual((self.n, 3), mass_fractions.shape)
+        np.testing.assert_array_equal(mass_fractions[:,0], self.mode_population.mass_fractions[0])
+        np.testing.assert_allclose(mass_fractions.sum(axis = 1), 1.0, atol = 1e-12)
+
 class TestAerosolModalSizePopulation(unittest.TestCase):
     """Unit tests for ambr.aerosol.AerosolModalSizePopulation"""
 
@@ -0,0 +1,44 @@
+# unit tests for the ambrs._dists package
+
+import ambrs
+import numpy as np
+import pickle
+import scipy.stats
+import unittest
+
+class TestDists(unittest.TestCase):
+    """Unit tests for ambrs.Uniform and ambrs.LogUniform"""
+
+    def setUp(self):
+        self.u = np.linspace(0, 1, 101)
+
+    def test_uniform(self):
+        dist = ambrs.Uniform(240, 550)
+        self.assertTrue(np.allclose(scipy.stats.uniform(240, 310).ppf(self.u),
+                                    dist.ppf(self.u), rtol = 1e-12))
+        x = dist.rvs(100, rng = 0)
+        self.assertEqual(100, len(x))
+        self.assertTrue(np.all((x >= 240) & (x <= 550)))
+        self.assertTrue(np.array_equal(x, dist.rvs(100, rng = np.random.default_rng(0))))
+        self.assertRaises(ValueError, ambrs.Uniform, 1, 0)
+
+    def test_loguniform(self):
+        dist = ambrs.LogUniform(3e7, 2e12)
+        self.assertTrue(np.allclose(scipy.stats.loguniform(3e7, 2e12).ppf(self.u),
+                                    dist.ppf(self.u), rtol = 1e-12))
+        x = dist.rvs(100, rng = 0)
+        self.assertEqual(100, len(x))
+        self.assertTrue(np.all((x >= 3e7) & (x <= 2e12)))
+        self.assertRaises(ValueError, ambrs.LogUniform, 0, 1)
+        self.assertRaises(ValueError, ambrs.LogUniform, 2, 1)
+
+    def test_hash_and_pickle(self):
+        for dist in [ambrs.Uniform(0, 1), ambrs.LogUniform(1e-8, 6e-8)]:
+            copy = pickle.loads(pickle.dumps(dist))
+            self.assertEqual(dist, copy)
+            self.assertEqual(hash(dist), hash(copy))
+            with self.assertRaises(AttributeError):
+                dist.lo = 0.5
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# unit tests for the ambrs._fast_dists package
+
+import ambrs._fast_dists as fast_dists
+import numpy as np
+import scipy.stats
+import unittest
+
+class TestFastDists(unittest.TestCase):
+    """Unit tests for ambrs._fast_dists"""
+
+    def setUp(self):
+        self.u = np.linspace(0, 1, 101)
+
+    def test_uniform(self):
+        dist = scipy.stats.uniform(240, 310)
+        ppf, lo, hi = fast_dists.fast_ppf(dist)
+        self.assertIs(fast_dists.uniform_ppf, ppf)
+        self.assertEqual((240, 550), (lo, hi))
+        self.assertTrue(np.allclose(dist.ppf(self.u), ppf(self.u, lo, hi), rtol = 1e-12))
+
+        # parameters can also be given by keyword
+        dist = scipy.stats.uniform(loc = 240, scale = 310)
+        ppf, lo, hi = fast_dists.fast_ppf(dist)
+        self.assertEqual((240, 550), (lo, hi))
+        self.assertTrue(np.allclose(dist.ppf(self.u), ppf(self.u, lo, hi), rtol = 1e-12))
+
+    def test_loguniform(self):
+        dist = scipy.stats.loguniform(3e7, 2e12)
+        ppf, lo, hi = fast_dists.fast_ppf(dist)
+        self.assertIs(fast_dists.loguniform_ppf, ppf)
+        self.assertEqual((3e7, 2e12), (lo, hi))
+        self.assertTrue(np.allclose(dist.ppf(self.u), ppf(self.u, lo, hi), rtol = 1e-12))
+
+        # scaled loguniform distributions are still loguniform...
+        dist = scipy.stats.loguniform(1, 2, scale = 3)
+        ppf, lo, hi = fast_dists.fast_ppf(dist)
+        self.assertEqual((3, 6), (lo, hi))
+        self.assertTrue(np.allclose(dist.ppf(self.u), ppf(self.u, lo, hi), rtol = 1e-12))
+
+        # ...but shifted ones aren't
+        self.assertIsNone(fast_dists.fast_ppf(scipy.stats.loguniform(1, 2, loc = 1)))
+        self.assertIsNone(fast_dists.fast_ppf(scipy.stats.loguniform(1, 2, 1)))
+
+    def test_invalid_distributions(self):
+        # parameters rejected by scipy.stats are rejected here too
+        self.assertRaises(ValueError, fast_dists.fast_ppf, scipy.stats.uniform(0, -1))
+        self.assertRaises(ValueError, fast_dists.fast_ppf, scipy.stats.loguniform(2, 1))
+        self.assertRaises(ValueError, fast_dists.fast_ppf, scipy.stats.loguniform(0, 0.99))
+        self.assertRaises(ValueError, fast_dists.check_uniform_bounds, 1, 0)
+        self.assertRaises(ValueError, fast_dists.check_loguniform_bounds, 0, 1)
+
+    def test_other_distributions(self):
+        self.assertIsNone(fast_dists.fast_ppf(scipy.stats.norm(0, 1)))
+
+    def test_rvs(self):
+        rng = np.random.default_rng(0)
+        x = fast_dists.uniform_rvs(240, 550, 100, rng)
+        self.assertTrue(np.all((x >= 240) & (x <= 550)))
+        x = fast_dists.loguniform_rvs(3e7, 2e12, 100, rng)
+        self.assertTrue(np.all((x >= 3e7) & (x <= 2e12)))
+
+if __name__ == '__main__':
+    unittest.main()
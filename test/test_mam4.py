@@ -206,6 +206,11 @@ class TestMAM4AerosolModel(unittest.TestCase):
         self.assertTrue(abs(scenario.size.modes[3].mass_fractions[1] - input.mfbc4)  < 1e-12)
 
         # test that passing invalid parameters raises exceptions appropriately
+        bad_scenario = self.ensemble.member(0)
+        bad_scenario.size.modes[3].species = (pom, so4) # no bc in primary carbon mode
+        bad_args = [bad_scenario, dt, nstep]
+        self.assertRaises(ValueError, model.create_input, *bad_args)
+
         bad_scenario = scenario
         bad_scenario.size = None
         bad_args = [bad_scenario, dt, nstep]
@@ -283,6 +288,10 @@ class TestMAM4AerosolModel(unittest.TestCase):
             self.assertTrue(abs(scenario.size.modes[3].mass_fractions[0] - input.mfpom4) < 1e-12)
             self.assertTrue(abs(scenario.size.modes[3].mass_fractions[1] - input.mfbc4)  < 1e-12)
 
+        # inputs created for the whole ensemble match those for its members
+        for i, input in enumerate(inputs):
+            self.assertEqual(model.create_input(self.ensemble.member(i), dt, nstep), input)
+
         # test that passing invalid parameters raises exceptions appropriately
         bad_ensemble = ppe.Ensemble(
             aerosols = self.ensemble.aerosols,
@@ -320,6 +329,11 @@ class TestMAM4AerosolModel(unittest.TestCase):
         temp_dir = tempfile.TemporaryDirectory()
         model.write_input_files(input, temp_dir.name, 'namelist')
         self.assertTrue(os.path.exists(os.path.join(temp_dir.name, 'namelist')))
+        with open(os.path.join(temp_dir.name, 'namelist')) as f:
+            content = f.read()
+        self.assertIn(f'  temp           = {input.temp},\n', content)
+        self.assertIn(f'  mfbc4          = {input.mfbc4},\n', content)
+        self.assertIn(f'  qsoag          = {input.qsoag},\n', content)
         temp_dir.cleanup()
 
 if __name__ == '__main__':
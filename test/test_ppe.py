@@ -1,11 +1,15 @@
 # unit tests for the ambrs.ppe package
 
+import ambrs
+import ambrs._fast_dists as fast_dists
 import ambrs.aerosol as aerosol
 import ambrs.gas as gas
 import ambrs.ppe as ppe
 from ambrs.scenario import Scenario
+import copy
 from math import log10
 import numpy as np
+import pickle
 import scipy.stats
 import unittest
 
@@ -124,16 +128,92 @@ class TestEnsemble(unittest.TestCase):
     def test_iteration(self):
         for scenario in self.ensemble:
             self.assertEqual(self.ref_scenario, scenario)
+            self.assertIsInstance(scenario, Scenario)
+            self.assertIsInstance(scenario.size, aerosol.AerosolModalSizeState)
+            # iteration yields read-only views of ensemble members
+            with self.assertRaises(AttributeError):
+                scenario.temperature = 300.0
+
+        # copies of views are modifiable members
+        view = next(iter(self.ensemble))
+        for scenario in [copy.copy(view), copy.deepcopy(view)]:
+            self.assertIs(Scenario, type(scenario))
+            self.assertEqual(view, scenario)
+            scenario.temperature = 300.0
+            self.assertNotEqual(view, scenario)
+
+        # pickled views unpickle as members, without the rest of the ensemble
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            data = pickle.dumps(view, protocol = protocol)
+            scenario = pickle.loads(data)
+            self.assertIs(Scenario, type(scenario))
+            self.assertIs(aerosol.AerosolModalSizeState, type(scenario.size))
+            self.assertEqual(view, scenario)
+            self.assertLessEqual(len(data), 2 * len(pickle.dumps(self.ensemble.member(0), protocol = protocol)))
 
     def test_member(self):
         for i in range(self.n):
             self.assertEqual(self.ref_scenario, self.ensemble.member(i))
 
+        # members differing in any scalar, gas concentration, or mode differ
+        scenario = self.ensemble.member(0)
+        scenario.temperature = 300.0
+        self.assertNotEqual(self.ref_scenario, scenario)
+        scenario = self.ensemble.member(0)
+        scenario.gas_concs = (1e4, 1e5, 2e6)
+        self.assertNotEqual(self.ref_scenario, scenario)
+        scenario = self.ensemble.member(0)
+        scenario.size.modes[0].geom_mean_diam = 2e-7
+        self.assertNotEqual(self.ref_scenario, scenario)
+        self.assertNotEqual(scenario, next(iter(self.ensemble)))
+
+    def test_species_idx(self):
+        self.assertEqual(1, len(self.ensemble.species_idx))
+        self.assertEqual(np.int32, self.ensemble.species_idx[0].dtype)
+        self.assertEqual([0, 1, 2], self.ensemble.species_idx[0].tolist())
+
+        # a mode's species needn't be ordered like the ensemble's aerosols
+        ensemble = ppe.Ensemble(
+            aerosols = (ncl, so4, soa),
+            gases = self.ensemble.gases,
+            size = self.ensemble.size,
+            gas_concs = self.ensemble.gas_concs,
+            flux = self.ensemble.flux,
+            relative_humidity = self.ensemble.relative_humidity,
+            temperature = self.ensemble.temperature,
+            pressure = p0,
+            height = h0,
+        )
+        self.assertEqual([1, 2, 0], ensemble.species_idx[0].tolist())
+
+        # every species in a mode must appear in the ensemble's aerosols
+        bad_args = {
+            'aerosols': (so4, soa),
+            'gases': self.ensemble.gases,
+            'size': self.ensemble.size,
+            'gas_concs': self.ensemble.gas_concs,
+            'flux': self.ensemble.flux,
+            'relative_humidity': self.ensemble.relative_humidity,
+            'temperature': self.ensemble.temperature,
+            'pressure': p0,
+            'height': h0,
+        }
+        self.assertRaises(ValueError, ppe.Ensemble, **bad_args)
+
     def test_ensemble_from_scenarios(self):
         ensemble = ppe.ensemble_from_scenarios([self.ref_scenario for i in range(self.n)])
         for scenario in ensemble:
             self.assertEqual(self.ref_scenario, scenario)
 
+        # distinct scenarios
+        scenarios = [self.ensemble.member(i) for i in range(self.n)]
+        for i, scenario in enumerate(scenarios):
+            scenario.temperature = 273.0 + i
+        ensemble = ppe.ensemble_from_scenarios(scenarios)
+        self.assertEqual(self.n, len(ensemble))
+        for i, scenario in enumerate(ensemble):
+            self.assertEqual(scenarios[i], scenario)
+
 class TestSampling(unittest.TestCase):
     """Unit tests for ambr.ppe sampling functions"""
 
@@ -208,11 +288,29 @@ class TestSampling(unittest.TestCase):
             height = h0,
         )
 
+    def test_flat_params(self):
+        params = self.ensemble_spec._flat_params
+        self.assertEqual(9 + 6 + 9 + 5 + 3 + 3, len(params))
+        self.assertEqual('accumulation.number', params[0].path)
+        self.assertTrue(params[0].is_log)
+        self.assertEqual((3e7, 2e12), (params[0].lo, params[0].hi))
+        self.assertEqual('accumulation.log10_geom_std_dev', params[2].path)
+        self.assertTrue(params[2].is_fixed)
+        self.assertEqual((log10(1.6), log10(1.6)), (params[2].lo, params[2].hi))
+        self.assertEqual(len(params) - 4, len(self.ensemble_spec._random_params))
+        self.assertEqual('temperature', params[-1].path)
+        self.assertFalse(params[-1].is_log)
+        self.assertEqual((240, 550), (params[-1].lo, params[-1].hi))
+
     def test_sample(self):
         ensemble = ppe.sample(self.ensemble_spec, self.n)
         self.assertEqual(self.n, len(ensemble))
         self.assertIsNotNone(ensemble.specification)
         for member in ensemble:
+            self.assertTrue(member.temperature >= 240)
+            self.assertTrue(member.temperature <= 550)
+            self.assertTrue(member.flux >= 1e-2*1e-9)
+            self.assertTrue(member.flux <= 1e1*1e-9)
             self.assertIsInstance(member.size, aerosol.AerosolModalSizeState)
             self.assertEqual(4, len(member.size.modes))
             for mode in member.size.modes:
@@ -220,7 +318,40 @@ class TestSampling(unittest.TestCase):
                 self.assertTrue(mode.number <= 2e12)
                 self.assertTrue(mode.geom_mean_diam >= 0.5e-8)
                 self.assertTrue(mode.geom_mean_diam <= 2e-6)
-                self.assertTrue(sum(mode.mass_fractions) - 1.0 < 1e-12)
+        for mode in ensemble.size.modes:
+            mass_fractions = mode.mass_fractions_matrix
+            np.testing.assert_allclose(mass_fractions.sum(axis = 1), 1.0, atol = 1e-12)
+
+    def test_sampled_geom_std_dev(self):
+        mode = self.ensemble_spec.size.modes[1]
+        spec = ppe.EnsembleSpecification(
+            name = 'aitken_ensemble',
+            aerosols = self.ensemble_spec.aerosols,
+            gases = self.ensemble_spec.gases,
+            size = aerosol.AerosolModalSizeDistribution(
+                modes = [
+                    aerosol.AerosolModeDistribution(
+                        name = mode.name,
+                        species = mode.species,
+                        number = mode.number,
+                        geom_mean_diam = mode.geom_mean_diam,
+                        log10_geom_std_dev = scipy.stats.uniform(log10(1.4), log10(1.8) - log10(1.4)),
+                        mass_fractions = mode.mass_fractions,
+                    ),
+                ],
+            ),
+            gas_concs = self.ensemble_spec.gas_concs,
+            flux = self.ensemble_spec.flux,
+            relative_humidity = self.ensemble_spec.relative_humidity,
+            temperature = self.ensemble_spec.temperature,
+            pressure = p0,
+            height = h0,
+        )
+        for ensemble in [ppe.sample(spec, self.n), ppe.lhs(spec, self.n)]:
+            log10_geom_std_dev = ensemble.size.modes[0].log10_geom_std_dev
+            self.assertTrue(np.all(log10_geom_std_dev >= log10(1.4)))
+            self.assertTrue(np.all(log10_geom_std_dev <= log10(1.8)))
+            self.assertTrue(len(np.unique(log10_geom_std_dev)) > 1)
 
     def test_lhs(self):
         ensemble = ppe.lhs(self.ensemble_spec, self.n)
@@ -234,7 +365,78 @@ class TestSampling(unittest.TestCase):
                 self.assertTrue(mode.number <= 2e12)
                 self.assertTrue(mode.geom_mean_diam >= 0.5e-8)
                 self.assertTrue(mode.geom_mean_diam <= 2e-6)
-                self.assertTrue(sum(mode.mass_fractions) - 1.0 < 1e-12)
+        for mode in ensemble.size.modes:
+            mass_fractions = mode.mass_fractions_matrix
+            np.testing.assert_allclose(mass_fractions.sum(axis = 1), 1.0, atol = 1e-12)
+        # each stratum of the (uniform) temperature distribution is sampled once
+        strata = np.floor((ensemble.temperature - 240) / 310 * self.n).astype(int)
+        self.assertTrue(np.array_equal(np.arange(self.n), np.sort(strata)))
+
+    def test_lhs_criteria(self):
+        for criterion in ['center', 'random-cd', 'maximin']:
+            ensemble = ppe.lhs(self.ensemble_spec, self.n, criterion = criterion)
+            self.assertEqual(self.n, len(ensemble))
+            strata = np.floor((ensemble.temperature - 240) / 310 * self.n).astype(int)
+            self.assertTrue(np.array_equal(np.arange(self.n), np.sort(strata)))
+
+        # pyDOE's criteria can't be reproducibly seeded with rng
+        self.assertRaises(ValueError, ppe.lhs, self.ensemble_spec, self.n,
+                          criterion = 'maximin', rng = 42)
+
+    def test_reproducibility(self):
+        for sampler in [ppe.sample, ppe.lhs]:
+            ensemble1 = sampler(self.ensemble_spec, self.n, rng = 42)
+            ensemble2 = sampler(self.ensemble_spec, self.n, rng = np.random.default_rng(42))
+            for member1, member2 in zip(ensemble1, ensemble2):
+                self.assertEqual(member1, member2)
+            ensemble3 = sampler(self.ensemble_spec, self.n, rng = 43)
+            self.assertFalse(np.array_equal(ensemble1.temperature, ensemble3.temperature))
+
+        # rng is keyword-only
+        self.assertRaises(TypeError, ppe.sample, self.ensemble_spec, self.n, 42)
+        self.assertRaises(TypeError, ppe.lhs, self.ensemble_spec, self.n, None, None, 42)
+
+    def test_lightweight_distributions(self):
+        # the same specification, with ambrs distributions in place of scipy's
+        def lightweight(dist):
+            ppf, lo, hi = fast_dists.fast_ppf(dist)
+            return ambrs.LogUniform(lo, hi) if ppf is fast_dists.loguniform_ppf else ambrs.Uniform(lo, hi)
+        modes = tuple([
+            aerosol.AerosolModeDistribution(
+                name = mode.name,
+                species = list(mode.species),
+                number = lightweight(mode.number),
+                geom_mean_diam = lightweight(mode.geom_mean_diam),
+                log10_geom_std_dev = mode.log10_geom_std_dev,
+                mass_fractions = [lightweight(mf) for mf in mode.mass_fractions],
+            ) for mode in self.ensemble_spec.size.modes
+        ])
+        spec = ppe.EnsembleSpecification(
+            name = self.ensemble_spec.name,
+            aerosols = self.ensemble_spec.aerosols,
+            gases = self.ensemble_spec.gases,
+            size = aerosol.AerosolModalSizeDistribution(modes = list(modes)),
+            gas_concs = [lightweight(gas_conc) for gas_conc in self.ensemble_spec.gas_concs],
+            flux = lightweight(self.ensemble_spec.flux),
+            relative_humidity = lightweight(self.ensemble_spec.relative_humidity),
+            temperature = lightweight(self.ensemble_spec.temperature),
+            pressure = p0,
+            height = h0,
+        )
+        self.assertEqual(ambrs.Uniform(240, 550), spec.temperature)
+        self.assertEqual(len(self.ensemble_spec._random_params), len(spec._random_params))
+
+        # sampling either specification gives the same ensemble
+        for sampler in [ppe.sample, ppe.lhs]:
+            ensemble1 = sampler(self.ensemble_spec, self.n, rng = 42)
+            ensemble2 = sampler(spec, self.n, rng = 42)
+            for member1, member2 in zip(ensemble1, ensemble2):
+                self.assertEqual(member1, member2)
+
+        # specifications with ambrs distributions are hashable and picklable,
+        # even if their modes, species, and mass fractions are given as lists
+        self.assertEqual(hash(spec), hash(pickle.loads(pickle.dumps(spec))))
+        self.assertEqual(spec, pickle.loads(pickle.dumps(spec)))
 
     def test_temperature_sweep(self):
         ref_state = ppe.sample(self.ensemble_spec, 1).member(0)
@@ -247,6 +449,23 @@ class TestSampling(unittest.TestCase):
             Ti = 273.0 + 1.0*i
             self.assertTrue(abs(Ti - member.temperature) < 1e-12)
 
+    def test_temperature_and_relative_humidity_sweep(self):
+        ref_state = ppe.sample(self.ensemble_spec, 1).member(0)
+        sweeps = ppe.AerosolParameterSweeps(
+            relative_humidity = ppe.LinearParameterSweep(0.0, 1.0, 10),
+            temperature = ppe.LinearParameterSweep(273.0, 373.0, 10),
+        )
+        ensemble = ppe.sweep(ref_state, sweeps)
+        self.assertEqual(100, len(ensemble))
+        for i, member in enumerate(ensemble):
+            # temperature varies fastest
+            RHi = 0.1*(i // 10)
+            Ti = 273.0 + 10.0*(i % 10)
+            self.assertTrue(abs(RHi - member.relative_humidity) < 1e-12)
+            self.assertTrue(abs(Ti - member.temperature) < 1e-12)
+            self.assertEqual(ref_state.size, member.size)
+            self.assertEqual(ref_state.gas_concs, member.gas_concs)
+
     def test_aitken_mode_number_conc_sweep(self):
         ref_state = ppe.sample(self.ensemble_spec, 1).member(0)
         sweeps = ppe.AerosolParameterSweeps(
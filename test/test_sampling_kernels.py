@@ -0,0 +1,60 @@
+# unit tests for the ambrs._sampling_kernels package
+
+import ambrs._sampling_kernels as kernels
+from math import log
+import numpy as np
+import unittest
+
+class TestFillMode(unittest.TestCase):
+    """Unit tests for ambrs._sampling_kernels.fill_mode"""
+
+    def setUp(self):
+        self.n = 100
+        rng = np.random.default_rng(0)
+        self.U = rng.random((self.n, 6))
+        # loguniform number and diameter, fixed log10 geometric std dev,
+        # uniform mass fractions
+        self.lows = np.array([log(3e7), log(1e-8), 0.2, 0.0, 0.0, 0.0])
+        self.highs = np.array([log(2e12), log(6e-8), 0.2, 1.0, 1.0, 1.0])
+        self.is_log = np.array([True, True, False, False, False, False])
+
+    def test_fill_mode(self):
+        out = np.empty((self.n, 6))
+        kernels.fill_mode(self.U, self.lows, self.highs, self.is_log, out)
+        self.assertTrue(np.all(out[:,0] >= 3e7))
+        self.assertTrue(np.all(out[:,0] <= 2e12))
+        self.assertTrue(np.all(out[:,1] >= 1e-8))
+        self.assertTrue(np.all(out[:,1] <= 6e-8))
+        self.assertTrue(np.all(out[:,2] == 0.2))
+        self.assertTrue(np.all(np.abs(out[:,3:].sum(axis = 1) - 1.0) < 1e-12))
+
+    @unittest.skipUnless(kernels.have_numba, 'numba is not installed')
+    def test_fill_mode_numba(self):
+        # compare the numba kernel (used only for large ensembles) against the
+        # numpy implementation
+        out = np.empty((self.n, 6))
+        kernels._fill_mode_numba(self.U, self.lows, self.highs, self.is_log, out)
+        numpy_out = np.empty((self.n, 6))
+        kernels._fill_mode_numpy(self.U, self.lows, self.highs, self.is_log, numpy_out)
+        self.assertTrue(np.allclose(numpy_out, out, rtol = 1e-12))
+
+        # map quantiles stored in (strided) columns of a larger buffer in place
+        buffer = np.zeros((self.n, 8))
+        buffer[:,1:7] = self.U
+        kernels._fill_mode_numba(buffer[:,1:7], self.lows, self.highs, self.is_log, buffer[:,1:7])
+        self.assertTrue(np.allclose(numpy_out, buffer[:,1:7], rtol = 1e-12))
+
+    def test_fill_mode_in_place(self):
+        out = np.empty((self.n, 6))
+        kernels.fill_mode(self.U, self.lows, self.highs, self.is_log, out)
+
+        # map quantiles stored in (strided) columns of a larger buffer in place
+        buffer = np.zeros((self.n, 8))
+        buffer[:,1:7] = self.U
+        kernels.fill_mode(buffer[:,1:7], self.lows, self.highs, self.is_log, buffer[:,1:7])
+        self.assertTrue(np.allclose(out, buffer[:,1:7], rtol = 1e-12))
+        self.assertTrue(np.all(buffer[:,0] == 0.0))
+        self.assertTrue(np.all(buffer[:,7] == 0.0))
+
+if __name__ == '__main__':
+    unittest.main()